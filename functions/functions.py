@@ -9,7 +9,32 @@ from numpy.typing import NDArray
 from plotid.publish import publish
 from plotid.tagplot import tagplot
 
-import warnings
+import logging
+import os
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional, fall back to plain NumPy
+    njit = None
+
+try:
+    import hdf5plugin
+except ImportError:  # hdf5plugin is optional, fall back to built-in filters
+    hdf5plugin = None
+
+log = logging.getLogger(__name__)
+
+
+def _signal_compression() -> Dict[str, Any]:
+    """
+    Returns the dataset creation keywords for compressing measurement signals.
+    Uses Bitshuffle with LZ4 if hdf5plugin is installed, otherwise the
+    built-in shuffle and LZF filters of h5py.
+    """
+    if hdf5plugin is not None:
+        return dict(hdf5plugin.Bitshuffle(cname="lz4"))
+    return {"compression": "lzf", "shuffle": True}
+
 
 def generate_group_name(
     controller: Union[str, List[str]],
@@ -31,6 +56,79 @@ def generate_group_name(
     ]
 
 
+class H5Ctx:
+    """
+    Wraps an already opened HDF5 file and caches the handles of groups and
+    datasets as well as their attributes by path, so repeated lookups of the
+    same path do not create new h5py objects.
+
+    Supports "path in ctx" and "ctx[path]" and can therefore be passed to all
+    *_h functions instead of the file handle.
+    """
+
+    def __init__(self, f: h5.File) -> None:
+        self.f = f
+        self._objects: Dict[str, Any] = {}
+        self._attrs: Dict[str, Dict[str, Any]] = {}
+
+    def group(self, path: str) -> Any:
+        """
+        Returns the (cached) group or dataset at the given path.
+        """
+        obj = self._objects.get(path)
+        if obj is None:
+            obj = self.f[path]
+            self._objects[path] = obj
+        return obj
+
+    def attrs(self, path: str) -> Dict[str, Any]:
+        """
+        Returns the (cached) attributes of the group or dataset at the given path.
+        """
+        attrs = self._attrs.get(path)
+        if attrs is None:
+            attrs = dict(self.group(path).attrs)
+            self._attrs[path] = attrs
+        return attrs
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._objects or path in self.f
+
+    def __getitem__(self, path: str) -> Any:
+        return self.group(path)
+
+
+def _attrs(f: Union[h5.File, H5Ctx], path: str) -> Any:
+    """
+    Returns the attributes at the given path, cached if f is an H5Ctx.
+    """
+    if isinstance(f, H5Ctx):
+        return f.attrs(path)
+    return f[path].attrs
+
+
+def read_metadata_h(f: Union[h5.File, H5Ctx], path: str, attr_key: str) -> Any:
+    """
+    Reads metadata from a group or dataset in an already opened HDF5 file.
+
+    Parameters:
+        f (h5.File or H5Ctx): Opened HDF5 file handle.
+        path (str): Path to the group or dataset inside the file.
+        attr_key (str): Name of the metadata attribute to read.
+
+    Returns:
+        Any: Value of the metadata attribute if it exists, otherwise None.
+    """
+    if path not in f:
+        log.warning("Path '%s' does not exist in the HDF5 file.", path)
+        return None
+    attrs = _attrs(f, path)
+    if attr_key not in attrs:
+        log.warning("Attribute '%s' does not exist at path '%s'.", attr_key, path)
+        return None
+    return attrs[attr_key]
+
+
 def read_metadata(file: str, path: str, attr_key: str) -> Any:
     """
     Reads metadata from a group or dataset in an HDF5 file.
@@ -45,19 +143,127 @@ def read_metadata(file: str, path: str, attr_key: str) -> Any:
     """
     try:
         with h5.File(file, "r") as f:
-            if path not in f:
-                warnings.warn(f"Path '{path}' does not exist in the HDF5 file.")
-                return None
-            obj = f[path] 
-            if attr_key not in obj.attrs:
-                warnings.warn(f"Attribute '{attr_key}' does not exist at path '{path}'.")
-                return None 
-            return obj.attrs[attr_key]
+            return read_metadata_h(f, path, attr_key)
     except OSError:
-        warnings.warn("Could not open HDF5 file.")
+        log.warning("Could not open HDF5 file.")
         return None  
     
 
+def read_data_h(f: Union[h5.File, H5Ctx], path: str) -> Optional[NDArray]:
+    """
+    Reads a dataset from an already opened HDF5 file and returns it as a 1D numpy array.
+
+    Parameters:
+        f (h5.File or H5Ctx): Opened HDF5 file handle.
+        path (str): Path to the dataset inside the HDF5 file.
+
+    Returns:
+        Optional[NDArray]: The dataset as a numpy array or None if the path does not exist
+                           or is not a dataset.
+    """
+    try:
+        if path not in f:
+            log.warning("Dataset '%s' does not exist.", path)
+            return None
+        if not isinstance(f[path], h5.Dataset):
+            log.warning("Path '%s' is not a dataset.", path)
+            return None
+        return _read_dataset(f[path])
+    except Exception as exc:
+        log.warning("%s", exc)
+        return None
+
+
+def load_group_attrs(
+    f: Union[h5.File, H5Ctx], group: str, number_of_runs: int = 10
+) -> Tuple[Any, List[Any]]:
+    """
+    Reads the setpoint of a group and the analyse start time index of all
+    its runs in one pass over the already opened HDF5 file.
+
+    Parameters:
+        f (h5.File or H5Ctx): Opened HDF5 file handle.
+        group (str): Name of the group inside the HDF5 file.
+        number_of_runs (int): Number of runs (run_01, run_02, ...) in the group.
+
+    Returns:
+        Tuple[Any, List[Any]]: The setpoint and a list with one start time index
+                               per run. Missing values are returned as None.
+    """
+    if group not in f:
+        log.warning("Path '%s' does not exist in the HDF5 file.", group)
+        return None, [None] * number_of_runs
+
+    setpoint = _attrs(f, group).get("setpoint")
+    if setpoint is None:
+        log.warning("Attribute 'setpoint' does not exist at path '%s'.", group)
+    start_time_indices = []
+    for run_id in range(1, number_of_runs + 1):
+        run_path = f"{group}/run_{run_id:02d}"
+        if run_path not in f:
+            log.warning("Path '%s' does not exist in the HDF5 file.", run_path)
+            start_time_indices.append(None)
+            continue
+        start_time_index = _attrs(f, run_path).get("analyse_start_time_index")
+        if start_time_index is None:
+            log.warning(
+                "Attribute 'analyse_start_time_index' does not exist at path '%s'.",
+                run_path,
+            )
+        start_time_indices.append(start_time_index)
+    return setpoint, start_time_indices
+
+
+def read_datasets_h(
+    f: Union[h5.File, H5Ctx], path: str, dataset_names: List[str]
+) -> List[Optional[NDArray]]:
+    """
+    Reads several datasets below one group of an already opened HDF5 file.
+    The group is looked up only once and every dataset is read directly
+    into a preallocated numpy array.
+
+    Parameters:
+        f (h5.File or H5Ctx): Opened HDF5 file handle.
+        path (str): Path to the group containing the datasets.
+        dataset_names (List[str]): Names of the datasets inside the group.
+
+    Returns:
+        List[Optional[NDArray]]: One array per dataset name, None for datasets that
+                                 do not exist or could not be read.
+    """
+    if path not in f:
+        log.warning("Path '%s' does not exist in the HDF5 file.", path)
+        return [None] * len(dataset_names)
+    group = f[path]
+
+    arrays = []
+    for name in dataset_names:
+        try:
+            if name not in group:
+                log.warning("Dataset '%s/%s' does not exist.", path, name)
+                arrays.append(None)
+                continue
+            if not isinstance(group[name], h5.Dataset):
+                log.warning("Path '%s/%s' is not a dataset.", path, name)
+                arrays.append(None)
+                continue
+            arrays.append(_read_dataset(group[name]))
+        except Exception as exc:
+            log.warning("%s", exc)
+            arrays.append(None)
+    return arrays
+
+
+def _read_dataset(dataset: h5.Dataset) -> NDArray:
+    """
+    Reads a whole dataset into a preallocated numpy array.
+    """
+    out = np.empty(dataset.shape, dtype=dataset.dtype)
+    if out.size:
+        dataset.read_direct(out)
+    return out
+
+
 def read_data(file: str, path: str) -> Optional[NDArray]:
     """
     Reads a dataset from an HDF5 file and returns it as a 1D numpy array.
@@ -72,19 +278,198 @@ def read_data(file: str, path: str) -> Optional[NDArray]:
     """
     try:
         with h5.File(file, "r") as f: 
-            if path not in f:
-                warnings.warn(f"Dataset '{path}' does not exist.")
-                return None
-            if not isinstance(f[path], h5.Dataset):
-                warnings.warn(f"Path '{path}' is not a dataset.")
-                return None
-            return np.asarray(f[path])
+            return read_data_h(f, path)
     except Exception as exc:
-        warnings.warn(str(exc)) 
+        log.warning("%s", exc) 
         return None 
 
 
-def cap_service_data(service_data: NDArray, setpoint: float) -> NDArray:
+def convert_to_signal_layout(
+    source_file: str, target_file: str, dataset_names: List[str]
+) -> None:
+    """
+    Rewrites an HDF5 measurement file so that all runs of a group are stored
+    in one chunked 2D-per-run dataset "signals" of shape (runs, channels, time).
+    Every chunk holds one complete run, so a run is read with a single chunk
+    access instead of one dataset access per channel.
+
+    Runs shorter than the longest run are padded with NaN, the number of valid
+    samples per run is stored in the dataset "lengths". Runs with missing channels
+    or channels of different lengths get length 0 and are read as missing data.
+    Group and run attributes
+    are copied, run groups are kept (without datasets) for their attributes.
+    The signals are compressed, see _signal_compression().
+
+    The file is written to a temporary file first and only moved to target_file
+    when it is complete. Modification time and size of the source file are stored
+    as root attributes, see signal_layout_is_current().
+
+    Parameters:
+        source_file (str): Path to the HDF5 file with one dataset per channel and run.
+        target_file (str): Path to the HDF5 file to be written.
+        dataset_names (List[str]): Names of the channel datasets of every run.
+    """
+    tmp_file = f"{target_file}.tmp"
+    try:
+        _write_signal_layout(source_file, tmp_file, dataset_names)
+        os.replace(tmp_file, target_file)
+    except BaseException:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+        raise
+
+
+def _write_signal_layout(
+    source_file: str, target_file: str, dataset_names: List[str]
+) -> None:
+    """
+    Writes the signal layout of convert_to_signal_layout() to target_file.
+    """
+    source_stat = os.stat(source_file)
+    with h5.File(source_file, "r") as src, h5.File(target_file, "w") as dst:
+        dst.attrs["source_mtime_ns"] = source_stat.st_mtime_ns
+        dst.attrs["source_size"] = source_stat.st_size
+        for group_name, group in src.items():
+            grp = dst.create_group(group_name)
+            grp.attrs.update(group.attrs)
+
+            runs = sorted(name for name, obj in group.items() if isinstance(obj, h5.Group))
+            lengths = np.zeros(len(runs), dtype=np.int64)
+            for i, run in enumerate(runs):
+                grp.create_group(run).attrs.update(group[run].attrs)
+                if not all(name in group[run] for name in dataset_names):
+                    continue
+                channel_lengths = {group[run][name].shape[0] for name in dataset_names}
+                if len(channel_lengths) > 1:
+                    log.warning(
+                        "Channels of '%s/%s' have different lengths, run is stored as missing.",
+                        group_name,
+                        run,
+                    )
+                    continue
+                lengths[i] = channel_lengths.pop()
+            if not runs:
+                continue
+
+            max_length = max(int(lengths.max()), 1)
+            signals = grp.create_dataset(
+                "signals",
+                shape=(len(runs), len(dataset_names), max_length),
+                dtype=np.float64,
+                chunks=(1, len(dataset_names), max_length),
+                fillvalue=np.nan,
+                **_signal_compression(),
+            )
+            signals.attrs["runs"] = runs
+            signals.attrs["channels"] = dataset_names
+            grp.create_dataset("lengths", data=lengths)
+
+            for i, run in enumerate(runs):
+                if lengths[i] == 0:
+                    continue
+                block = np.full((len(dataset_names), max_length), np.nan)
+                for j, name in enumerate(dataset_names):
+                    data = _read_dataset(group[run][name])
+                    block[j, : data.shape[0]] = data
+                signals[i] = block
+
+
+def signal_layout_is_current(source_file: str, target_file: str) -> bool:
+    """
+    Checks whether target_file was written by convert_to_signal_layout() from
+    the current version of source_file.
+
+    Parameters:
+        source_file (str): Path to the HDF5 file with one dataset per channel and run.
+        target_file (str): Path to the converted HDF5 file.
+
+    Returns:
+        bool: True if target_file exists, matches modification time and size
+              of source_file and all its compression filters can be read in the
+              current environment (e.g. without hdf5plugin), otherwise False.
+    """
+    if not os.path.exists(target_file):
+        return False
+    source_stat = os.stat(source_file)
+    try:
+        with h5.File(target_file, "r") as f:
+            if (
+                f.attrs.get("source_mtime_ns") != source_stat.st_mtime_ns
+                or f.attrs.get("source_size") != source_stat.st_size
+            ):
+                return False
+            for group in f.values():
+                if "signals" in group and not _filters_available(group["signals"]):
+                    return False
+            return True
+    except OSError:
+        return False
+
+
+def _filters_available(dataset: h5.Dataset) -> bool:
+    """
+    Checks whether all filters of a dataset are available for reading.
+    """
+    plist = dataset.id.get_create_plist()
+    return all(
+        h5.h5z.filter_avail(plist.get_filter(i)[0])
+        for i in range(plist.get_nfilters())
+    )
+
+
+def read_run_signals_h(
+    f: Union[h5.File, H5Ctx], group: str, run: str, dataset_names: List[str]
+) -> List[Optional[NDArray]]:
+    """
+    Reads the measurement channels of one run from an already opened HDF5 file.
+    Files written by convert_to_signal_layout() are read with one access to the
+    "signals" dataset, other files fall back to read_datasets_h().
+
+    Parameters:
+        f (h5.File or H5Ctx): Opened HDF5 file handle.
+        group (str): Name of the group inside the HDF5 file.
+        run (str): Name of the run inside the group, e.g. "run_01".
+        dataset_names (List[str]): Names of the channels to return.
+
+    Returns:
+        List[Optional[NDArray]]: One array per channel name, None for channels
+                                 that do not exist.
+    """
+    signals_path = f"{group}/signals"
+    if group not in f or signals_path not in f:
+        return read_datasets_h(f, f"{group}/{run}", dataset_names)
+
+    signals = f[signals_path]
+    signals_attrs = _attrs(f, signals_path)
+    runs = list(signals_attrs["runs"])
+    if run not in runs:
+        log.warning("Path '%s/%s' does not exist in the HDF5 file.", group, run)
+        return [None] * len(dataset_names)
+    row = runs.index(run)
+    length = int(f[f"{group}/lengths"][row])
+    if length == 0:
+        log.warning("Missing measurement data in '%s/%s'.", group, run)
+        return [None] * len(dataset_names)
+
+    try:
+        block = signals[row]
+    except OSError as exc:
+        log.warning("Could not read '%s/%s': %s", group, run, exc)
+        return [None] * len(dataset_names)
+    channels = list(signals_attrs["channels"])
+    arrays = []
+    for name in dataset_names:
+        if name not in channels:
+            log.warning("Dataset '%s/%s/%s' does not exist.", group, run, name)
+            arrays.append(None)
+            continue
+        arrays.append(block[channels.index(name), :length])
+    return arrays
+
+
+def cap_service_data(
+    service_data: NDArray, setpoint: float, out: Optional[NDArray] = None
+) -> NDArray:
     """
     Caps service data values according to the setpoint:
         - Values greater than setpoint are set to setpoint.
@@ -94,8 +479,10 @@ def cap_service_data(service_data: NDArray, setpoint: float) -> NDArray:
     Parameters:
         service_data (NDArray): Array of service data values.
         setpoint (float): The maximum allowed value (setpoint).
+        out (Optional[NDArray]): Array to write the result to, e.g. service_data
+                                 itself to cap in place. A new array is allocated if None.
     """
-    capped = np.clip(service_data, 0.0, setpoint)
+    capped = np.clip(service_data, 0.0, setpoint, out=out)
     return capped 
 
 
@@ -106,19 +493,105 @@ def check_negative_values(array: NDArray) -> bool:
     return np.all(array >= 0.0) 
 
 
-def integral_with_time_step(data: NDArray, time_steps: NDArray) -> float:
+if njit is not None:
+
+    # Like fastmath=True but without "nnan", so NaN values are handled as usual
+    # (NaN propagates into the integral and fails the non-negativity check)
+    _FASTMATH_FLAGS = {"reassoc", "contract", "arcp"}
+
+    @njit(cache=True, nogil=True, fastmath=_FASTMATH_FLAGS)
+    def _trapz_dt(data, dt):
+        integral = 0.0
+        for i in range(dt.shape[0]):
+            integral += 0.5 * (data[i] + data[i + 1]) * dt[i]
+        return integral
+
+    @njit(cache=True, nogil=True, fastmath=_FASTMATH_FLAGS)
+    def _trapz_dt_check(data, dt):
+        integral = 0.0
+        non_negative = True
+        for i in range(dt.shape[0]):
+            integral += 0.5 * (data[i] + data[i + 1]) * dt[i]
+            if not data[i] >= 0.0:
+                non_negative = False
+        if data.shape[0] > 0 and not data[data.shape[0] - 1] >= 0.0:
+            non_negative = False
+        return integral, non_negative
+
+else:
+
+    def _trapz_dt(data, dt):
+        return 0.5 * np.dot(data[1:] + data[:-1], dt)
+
+    def _trapz_dt_check(data, dt):
+        return _trapz_dt(data, dt), np.all(data >= 0.0)
+
+
+def _time_step_differences(
+    data: NDArray,
+    time_steps: Optional[NDArray],
+    dt: Optional[NDArray],
+) -> Optional[NDArray]:
+    """
+    Validates the time input of the integral functions and returns the time
+    step differences, computed from time_steps if dt is not given. Returns None
+    (with a warning) if the input does not fit to data.
+    """
+    if dt is None:
+        if time_steps is None:
+            log.warning("Either time steps or time step differences are required.")
+            return None
+        time_steps = np.asarray(time_steps, dtype=float)
+        if data.shape[0] != time_steps.shape[0]:
+            log.warning("Data and time arrays have different lengths.")
+            return None
+        return np.diff(time_steps)
+
+    dt = np.asarray(dt, dtype=float)
+    if data.shape[0] != dt.shape[0] + 1:
+        log.warning("Data and time step differences have incompatible lengths.")
+        return None
+    return dt
+
+
+def integral_with_time_step(
+    data: NDArray,
+    time_steps: Optional[NDArray] = None,
+    dt: Optional[NDArray] = None,
+) -> float:
     """
     Computes the integral using the trapezoidal rule with given time steps. 
+    Instead of the time steps, their precomputed differences (np.diff) can be
+    passed as dt, so they can be shared by several integrals over the same time.
     """
-    if len(data) != len(time_steps):
-        warnings.warn("Data and time arrays have different lengths.")
+    data = np.asarray(data, dtype=float)
+    dt = _time_step_differences(data, time_steps, dt)
+    if dt is None:
         return None
-    
-    integral = 0.0
-    for i in range (len(data) - 1):
-        dt = time_steps[i + 1] - time_steps[i]
-        integral += 0.5 * (data[i] + data[i + 1]) * dt 
-    return float(integral) 
+
+    return float(_trapz_dt(data, dt))
+
+
+def integral_with_negative_check(
+    data: NDArray,
+    time_steps: Optional[NDArray] = None,
+    dt: Optional[NDArray] = None,
+) -> Tuple[Optional[float], bool]:
+    """
+    Computes the integral like integral_with_time_step() and checks like
+    check_negative_values() whether all values are greater than or equal to
+    zero, in a single pass over the data.
+
+    Return:
+        Tuple containing (integral or None for invalid input, True if no value is negative)
+    """
+    data = np.asarray(data, dtype=float)
+    dt = _time_step_differences(data, time_steps, dt)
+    if dt is None:
+        return None, bool(check_negative_values(data))
+
+    integral, non_negative = _trapz_dt_check(data, dt)
+    return float(integral), bool(non_negative)
 
 
 def calculate_service_loss(service_fill: float, service_target: float) -> float:
@@ -148,50 +621,63 @@ def convert_Ws_to_Wh(energy_in_Ws: float) -> float:
     return energy_in_Ws / 3600.0 
 
 
-def calculate_mean_and_std(data: List[float]) -> Tuple[float, float]:
+def calculate_mean_and_std(data: Union[List[float], NDArray]) -> Tuple[float, float]:
     """
     Calculates the mean value and standard deviationof a one-dimensional datalist.
+    NaN values (e.g. runs with missing data) are ignored.
 
     Parameter:
-        data: List of float avlues.
+        data: List or array of float avlues.
     
     Return:
         Tuple containing (mean, standard deviation)
     """
     arr = np.asarray(data, dtype=float)
-    return float(np.mean(arr)), float(np.std(arr))  
+    mean = np.nanmean(arr)
+    return float(mean), float(np.nanstd(arr, mean=mean))  
 
 
 def save_dataframe_in_hdf5_with_metadata(
     df: pd.DataFrame,
     hdf5_path: str,
     group_name: str,
-    metadata: Dict[str, Any],
+    metadata: Dict[str, Union[str, int, float]],
 ) -> None:
     """
     Saves a DataFrame to an HDF5 file under a given group name and 
-    stores metadata as attributes of that group.
+    stores metadata as attributes of the subgroup "metadata" of that group.
 
     Parameters:
         df: DataFrame to be stored.
         hdf5_path_ Path to the HDF5 file.
         group_name: Name of the group inside the HDF5 file.
         metadata: Dictionary containing metadatato be stored as attributes. 
+                  Values must be strings or numbers.
+
+    Raises:
+        TypeError: If a metadata value cannot be stored as an HDF5 attribute.
     """
+    for key, value in metadata.items():
+        # Booleans are stored as HDF5 enums by h5py, which PyTables cannot read
+        if isinstance(value, (bool, np.bool_)) or not isinstance(
+            value, (str, int, float, np.number, np.str_)
+        ):
+            raise TypeError(
+                f"Metadata value for '{key}' must be a string or number, "
+                f"got {type(value).__name__}."
+            )
+
     with pd.HDFStore(hdf5_path, "a") as store:
 
         if group_name in store:
             store.remove(group_name) 
 
-        store.put(group_name, df, 'table')
+        store.put(group_name, df, format="fixed")
 
-        storer = store.get_storer(group_name)
-
-# Current implementation stores metadata items separately, but read_plot_data expects a single metadata attribute
-#        for key, value in metadata.items():
-#            storer.attrs[key] = value 
-
-        storer.attrs.metadata = metadata 
+    # Metadata items are stored as plain HDF5 attributes, so they can be read
+    # without PyTables and do not mix with the attributes written by pandas
+    with h5.File(hdf5_path, "a") as f:
+        f[group_name].create_group("metadata").attrs.update(metadata)
 
 
 def read_plot_data(
@@ -211,7 +697,16 @@ def read_plot_data(
     """
     with pd.HDFStore(file_path, mode="r") as store: 
         df = store[group_path] 
-        metadata = store.get_storer(group_path).attrs.metadata 
+        metadata_node = store.get_node(f"{group_path}/metadata")
+        if metadata_node is None:
+            # Files written before the metadata subgroup was introduced
+            metadata = store.get_storer(group_path).attrs.metadata 
+        else:
+            attrs = metadata_node._v_attrs
+            metadata = {
+                key: attrs[key].item() if isinstance(attrs[key], np.generic) else attrs[key]
+                for key in attrs._v_attrnamesuser
+            }
     return df, metadata 
 
 
@@ -231,23 +726,14 @@ def plot_service_loss_vs_power(
     fig, ax = plt.subplots()
 
 
-    for label in processed_data.index:
-        #ax.errorbar(
-        #    processed_data.loc[label, "service_loss_mean"],  # ✓ correct x
-        #    processed_data.loc[label, "servive_loss_std"],   # ✗ TYPO + WRONG value
-        #    xerr=processed_data.loc[label, "power_mean"],     # ✗ WRONG - should be service_loss_std
-        #    y_err=processed_data.loc[label, "power_std"],     # ✗ wrong parameter name (should be yerr)
-        #    fmt="o",
-        #    label=label,
-        #)
-
+    for row in processed_data.itertuples():
         ax.errorbar(
-            processed_data.loc[label, "service_loss_mean"],      # x values
-            processed_data.loc[label, "power_mean"],             # y values
-            xerr=processed_data.loc[label, "service_loss_std"],  # x error bars
-            yerr=processed_data.loc[label, "power_std"],         # y error bars
+            row.service_loss_mean,      # x values
+            row.power_mean,             # y values
+            xerr=row.service_loss_std,  # x error bars
+            yerr=row.power_std,         # y error bars
             fmt="o",
-            label=label,
+            label=row.Index,
         )
 
 
@@ -271,11 +757,11 @@ def publish_plot(
         source_paths: Path or list of paths to files required for the plot.
         destination_path: Folder where the plot and source files should be saved.
     """
-    tagplot(
+    output_dir = tagplot(
         fig,
         source_paths=source_paths,
         destination_path=destination_path,
         id_method="time",
         prefix="GdD_WS_2526_3774919",  # Replace with YOUR Matrikelnummer
     )
-    publish(destination_path)
\ No newline at end of file
+    publish(output_dir)
\ No newline at end of file
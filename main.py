@@ -1,8 +1,88 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Tuple
+
+import h5py as h5
 import numpy as np
 import pandas as pd
 
 from functions import functions as fn
 
+# Measurement channels of every run
+DATASET_NAMES = ["tank_1_pressure", "pump_1_power", "pump_2_power", "time"]
+
+# Number of experimental runs per group
+NUMBER_OF_RUNS = 10
+
+
+def process_run(
+    f: fn.H5Ctx,
+    group: str,
+    run_id: int,
+    setpoint: float,
+    start_time_index: int,
+) -> Tuple[float, float]:
+    """
+    Reads and analyses a single experimental run.
+
+    Parameters:
+        f: Opened HDF5 file with cached group handles.
+        group: Name of the group the run belongs to.
+        run_id: Number of the run (1 to 10).
+        setpoint: Setpoint of the group.
+        start_time_index: Index from which the service loss is calculated.
+
+    Return:
+        Tuple containing (service loss in percent, energy consumption in Wh).
+        Both values are NaN if measurement data is missing.
+    """
+    run = f"run_{run_id:02d}"
+
+    # Read measurement data
+    tank_pressure, pump_1, pump_2, time = fn.read_run_signals_h(
+        f, group, run, DATASET_NAMES
+    )
+
+    # Check if any data is missing
+    if any(x is None for x in (tank_pressure, pump_1, pump_2, time)):
+        print(f"Warning: Missing data in {group}, {run}. Appending NaN values.")
+        return np.nan, np.nan
+
+    # Cap service data, in place as the freshly read array is not used otherwise
+    service_fill = fn.cap_service_data(tank_pressure, setpoint, out=tank_pressure)
+
+    # Time step differences, shared by all integrals of this run
+    dt = np.diff(time)
+
+    # Calculate service fill integral from start_time_index onwards
+    analysed_time = time[start_time_index:]
+    service_fill_integral = fn.integral_with_time_step(
+        service_fill[start_time_index:],
+        dt=dt[start_time_index:]
+    )
+
+    # Calculate service target integral, the setpoint is constant so the
+    # integral is the setpoint times the analysed duration
+    service_target_integral = float(
+        setpoint * (analysed_time[-1] - analysed_time[0])
+    )
+
+    # Calculate service loss in percent
+    service_loss_percent = fn.calculate_service_loss(
+        service_fill_integral, service_target_integral
+    )
+
+    # Calculate total energy consumption for both pumps and check for
+    # negative values in pump power in the same pass
+    energy_pump_1, pump_1_valid = fn.integral_with_negative_check(pump_1, dt=dt)
+    energy_pump_2, pump_2_valid = fn.integral_with_negative_check(pump_2, dt=dt)
+    if not (pump_1_valid and pump_2_valid):
+        print(f"Warning: Negative power values in {group}, {run}")
+    total_energy_ws = energy_pump_1 + energy_pump_2
+    total_energy_wh = fn.convert_Ws_to_Wh(total_energy_ws)
+
+    return service_loss_percent, total_energy_wh
+
 
 def main():
     """
@@ -11,6 +91,12 @@ def main():
     # Setup file path
     file_path = "./data/data_GdD_WiSe2526.h5"
 
+    # Rewrite the data into one chunked signals dataset per group,
+    # again whenever the source file has changed
+    signals_file_path = "./data/data_GdD_WiSe2526_signals.h5"
+    if not fn.signal_layout_is_current(file_path, signals_file_path):
+        fn.convert_to_signal_layout(file_path, signals_file_path, DATASET_NAMES)
+
     # Define lists for controllers, topologies, and disruptions
     controllers = ["ARIMA", "DTW", "PID"]
     topologies = ["Coupled", "Decentral", "Central"]
@@ -22,7 +108,9 @@ def main():
     ]
 
     # Generate all possible group names
-    group_names = fn.generate_group_name(controllers, topologies, disruptions)
+    group_names = frozenset(
+        fn.generate_group_name(controllers, topologies, disruptions)
+    )
 
     # Define assigned groups (replace with your assigned groups from Moodle)
     considered_groups = [
@@ -32,106 +120,72 @@ def main():
         "PID_Decentral_PumpOutage"
     ]
 
-    # Initialize processed data DataFrame
-    processed_data = pd.DataFrame(
-        columns=[
-            "power_mean",
-            "power_std",
-            "service_loss_mean",
-            "service_loss_std",
-        ]
-    )
-
-    # Outer loop: Iterate through all groups
-    for group in group_names:
-        # Skip if not in considered groups
-        if group not in considered_groups:
-            continue
-
-        # Read setpoint metadata for this group
-        setpoint = fn.read_metadata(file_path, group, "setpoint")
-        if setpoint is None:
-            print(f"Warning: No setpoint found for group '{group}'. Skipping this group.")
-            continue
-
-        # Initialize lists for service loss and power for this group
-        groups_service_loss = []
-        groups_power = []
-
-        # Inner loop: Iterate through runs 1 to 10
-        for run_id in range(1, 11):
-            run = f"run_{run_id:02d}"
-            base_path = f"{group}/{run}"
-
-            # Read start time index metadata
-            start_time_index = fn.read_metadata(
-                file_path, base_path, "analyse_start_time_index"
-            )
-
-            # Read measurement data
-            tank_pressure = fn.read_data(file_path, f"{base_path}/tank_1_pressure")
-            pump_1 = fn.read_data(file_path, f"{base_path}/pump_1_power")
-            pump_2 = fn.read_data(file_path, f"{base_path}/pump_2_power")
-            time = fn.read_data(file_path, f"{base_path}/time")
-
-            # Check if any data is missing
-            if any(x is None for x in (tank_pressure, pump_1, pump_2, time)):
-                print(f"Warning: Missing data in {group}, {run}. Appending NaN values.")
-                groups_service_loss.append(np.nan)
-                groups_power.append(np.nan)
+    # Collect processed data rows per group
+    rows = {}
+
+    # Open the data file once and reuse the handle for all reads,
+    # runs of a group are processed in parallel by a shared thread pool
+    with h5.File(signals_file_path, "r") as h5_file, ThreadPoolExecutor(max_workers=4) as executor:
+        f = fn.H5Ctx(h5_file)
+        # Outer loop: Iterate through the considered groups
+        for group in considered_groups:
+            # Skip groups that are not a valid configuration
+            if group not in group_names:
+                print(f"Warning: Unknown group '{group}'. Skipping this group.")
                 continue
 
-            # Cap service data
-            service_fill = fn.cap_service_data(tank_pressure, setpoint)
-
-            # Check for negative values in pump power
-            if not (fn.check_negative_values(pump_1) and fn.check_negative_values(pump_2)):
-                print(f"Warning: Negative power values in {group}, {run}")
-
-            # Calculate service fill integral from start_time_index onwards
-            service_fill_integral = fn.integral_with_time_step(
-                service_fill[start_time_index:],
-                time[start_time_index:]
-            )
-
-            # Calculate service target integral
-            service_target_signal = np.full_like(
-                service_fill[start_time_index:], setpoint
-            )
-            service_target_integral = fn.integral_with_time_step(
-                service_target_signal,
-                time[start_time_index:]
+            # Read setpoint and start time indices of all runs for this group
+            setpoint, start_time_indices = fn.load_group_attrs(
+                f, group, NUMBER_OF_RUNS
             )
+            if setpoint is None:
+                print(f"Warning: No setpoint found for group '{group}'. Skipping this group.")
+                continue
 
-            # Calculate service loss in percent
-            service_loss_percent = fn.calculate_service_loss(
-                service_fill_integral, service_target_integral
+            # Results per run, runs with missing data stay NaN
+            groups_service_loss = np.full(NUMBER_OF_RUNS, np.nan)
+            groups_power = np.full(NUMBER_OF_RUNS, np.nan)
+
+            # Inner loop: Process runs 1 to 10 in parallel
+            results = executor.map(
+                lambda run_id: process_run(
+                    f,
+                    group,
+                    run_id,
+                    setpoint,
+                    start_time_indices[run_id - 1],
+                ),
+                range(1, NUMBER_OF_RUNS + 1),
             )
+            for i, (service_loss, power) in enumerate(results):
+                groups_service_loss[i] = service_loss
+                groups_power[i] = power
 
-            # Calculate total energy consumption for both pumps
-            total_energy_ws = (
-                fn.integral_with_time_step(pump_1, time) +
-                fn.integral_with_time_step(pump_2, time)
+            # Calculate mean and standard deviation for this group
+            mean_service_loss, std_service_loss = fn.calculate_mean_and_std(
+                groups_service_loss
             )
-            total_energy_wh = fn.convert_Ws_to_Wh(total_energy_ws)
-
-            # Append results to lists
-            groups_service_loss.append(service_loss_percent)
-            groups_power.append(total_energy_wh)
-
-        # Calculate mean and standard deviation for this group
-        mean_service_loss, std_service_loss = fn.calculate_mean_and_std(
-            groups_service_loss
-        )
-        mean_power, std_power = fn.calculate_mean_and_std(groups_power)
-
-        # Store results in processed_data DataFrame
-        processed_data.loc[group] = [
-            mean_power,
-            std_power,
-            mean_service_loss,
-            std_service_loss,
-        ]
+            mean_power, std_power = fn.calculate_mean_and_std(groups_power)
+
+            # Store results for this group
+            rows[group] = {
+                "power_mean": mean_power,
+                "power_std": std_power,
+                "service_loss_mean": mean_service_loss,
+                "service_loss_std": std_service_loss,
+            }
+
+    # Build processed data DataFrame from the collected rows
+    processed_data = pd.DataFrame.from_dict(
+        rows,
+        orient="index",
+        columns=[
+            "power_mean",
+            "power_std",
+            "service_loss_mean",
+            "service_loss_std",
+        ],
+    )
 
     # Define archive path
     data_archive_path = "./plotid/data_GdD_plot_WiSe2526.h5"
@@ -170,4 +224,5 @@ def main():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
     main()
\ No newline at end of file
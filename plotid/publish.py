@@ -1,15 +1,10 @@
-def publish(destination_path):
+def publish(output_dir):
     """
     Publishes the plot (in our case, just prints confirmation).
     
     Args:
-        destination_path: path where files were saved
+        output_dir: directory returned by tagplot() where files were saved
     """
-    from plotid.tagplot import _last_output_dir
-    
-    if _last_output_dir:
-        print(f"\n{'='*60}")
-        print(f"Published to: {_last_output_dir}")
-        print(f"{'='*60}\n")
-    else:
-        print(f"Published to: {destination_path}")
\ No newline at end of file
+    print(f"\n{'='*60}")
+    print(f"Published to: {output_dir}")
+    print(f"{'='*60}\n")
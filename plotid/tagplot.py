@@ -14,6 +14,9 @@ def tagplot(fig, source_paths, destination_path, id_method="time", prefix="plot"
         destination_path: where to save output
         id_method: method to generate ID (only 'time' supported)
         prefix: prefix for output files
+
+    Returns:
+        path of the output directory containing the plot and source files
     """
     # Generate timestamp ID
     if id_method == "time":
@@ -28,7 +31,7 @@ def tagplot(fig, source_paths, destination_path, id_method="time", prefix="plot"
     
     # Save the plot
     plot_filename = os.path.join(output_dir, f"{plot_id}.png")
-    fig.savefig(plot_filename, dpi=300, bbox_inches='tight')
+    fig.savefig(plot_filename, dpi=150)
     print(f"Plot saved to: {plot_filename}")
     
     # Copy source files
@@ -36,11 +39,13 @@ def tagplot(fig, source_paths, destination_path, id_method="time", prefix="plot"
         source_paths = [source_paths]
     
     for src in source_paths:
-        if os.path.exists(src):
-            dest_filename = os.path.basename(src)
-            dest_path = os.path.join(output_dir, dest_filename)
-            shutil.copy(src, dest_path)
-            print(f"Copied: {src} -> {dest_path}")
+        dest_filename = os.path.basename(src)
+        dest_path = os.path.join(output_dir, dest_filename)
+        try:
+            shutil.copyfile(src, dest_path)
+        except FileNotFoundError:
+            continue
+        print(f"Copied: {src} -> {dest_path}")
     
     # Create required_imports.txt (for plotid compatibility)
     imports_file = os.path.join(output_dir, "required_imports.txt")
@@ -50,12 +55,4 @@ def tagplot(fig, source_paths, destination_path, id_method="time", prefix="plot"
         f.write("matplotlib\n")
         f.write("h5py\n")
     
-    # Store the output directory for publish()
-    global _last_output_dir
-    _last_output_dir = output_dir
-    
-    return plot_id
-
-
-# Global variable to track last output
-_last_output_dir = None
\ No newline at end of file
+    return output_dir